@@ -1,42 +1,88 @@
 import os
 import re
+import hashlib
 import redis
-import secrets
+import base64
+import time
+import gzip
+import queue
+import threading
+from collections import OrderedDict
 from datetime import datetime, timezone, timedelta
-from functools import wraps
-from flask import Flask, render_template, request, jsonify
-from youtube_transcript_api import YouTubeTranscriptApi
+from contextlib import contextmanager
+from functools import wraps, lru_cache
+from urllib.parse import urlsplit, parse_qs
+from flask import Flask, render_template, request, jsonify, g
+from flask.json.provider import DefaultJSONProvider
+import orjson
+from youtube_transcript_api import YouTubeTranscriptApi, NoTranscriptFound
 from youtube_transcript_api.proxies import WebshareProxyConfig
-import requests
 from dotenv import load_dotenv
 from openai import OpenAI
 
 # Load environment variables from .env file
 load_dotenv()
 
+class OrjsonProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson (C extension) for faster jsonify/get_json"""
+
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        # Hand orjson's bytes straight to the response, skipping the str round-trip
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default), mimetype=self.mimetype
+        )
+
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Redis client initialization
 redis_client = None
+redis_connected = False  # Whether the startup ping succeeded
 try:
     redis_url = os.environ.get('REDIS_URL')
     if redis_url:
+        # Bounded, shared connection pool with short timeouts so a slow Redis
+        # fails open quickly instead of stalling requests. The pool blocks
+        # (briefly) when exhausted rather than erroring, since gevent workers
+        # can have far more concurrent requests than pooled connections.
+        pool_kwargs = {
+            'max_connections': int(os.environ.get('REDIS_POOL_SIZE', '32')),
+            'timeout': float(os.environ.get('REDIS_POOL_TIMEOUT', '1')),
+            'decode_responses': True,
+            'socket_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', '0.2')),
+            'socket_connect_timeout': float(os.environ.get('REDIS_SOCKET_TIMEOUT', '0.2')),
+            # Identify our connections in CLIENT LIST (set once per connection)
+            'client_name': 'simpleyoutube',
+            'lib_name': 'redis-py(simpleyoutube)',
+        }
+
         # Handle SSL connections for Redis Cloud
         if redis_url.startswith('rediss://'):
             import ssl
-            redis_client = redis.from_url(
-                redis_url, 
-                decode_responses=True,
+            pool_kwargs.update(
                 ssl_cert_reqs=ssl.CERT_NONE,
                 ssl_check_hostname=False,
                 ssl_ca_certs=None
             )
-        else:
-            redis_client = redis.from_url(redis_url, decode_responses=True)
+
+        redis_pool = redis.BlockingConnectionPool.from_url(redis_url, **pool_kwargs)
+        redis_client = redis.Redis(connection_pool=redis_pool)
         
-        # Test connection
-        redis_client.ping()
-        print(f"✅ Redis connected: {redis_url[:30]}...")
+        # Test connection, but keep the client if it fails: the short connect
+        # timeout above can trip on a slow first (TLS) connect at boot, and
+        # per-request calls already fail open until Redis is reachable
+        try:
+            redis_connected = redis_client.ping()
+            print(f"✅ Redis connected: {redis_url[:30]}...")
+        except redis.RedisError as e:
+            print(f"⚠️  Redis ping failed, will retry on each request: {e}")
     else:
         print("⚠️  No REDIS_URL found - rate limiting disabled")
 except Exception as e:
@@ -46,6 +92,16 @@ except Exception as e:
 # Rate limiting configuration
 DAILY_LIMIT = int(os.environ.get('DAILY_LIMIT', '10'))
 ADMIN_TOKEN = os.environ.get('ADMIN_TOKEN')
+MAX_BYPASS_BATCH = 100  # Max bypass keys issued per admin request
+
+# Transcript caching: per-process LRU size (transcripts can be MBs each) and
+# TTL (so workers pick up replaced transcripts), TTL of the shared Redis copy
+# (0 disables it) and the largest transcript stored in Redis, which also holds
+# the rate limit counters and must not fill up
+TRANSCRIPT_CACHE_SIZE = int(os.environ.get('TRANSCRIPT_CACHE_SIZE', '64'))
+TRANSCRIPT_MEMORY_TTL = int(os.environ.get('TRANSCRIPT_MEMORY_TTL', '3600'))
+TRANSCRIPT_CACHE_TTL = int(os.environ.get('TRANSCRIPT_CACHE_TTL', str(24 * 3600)))
+TRANSCRIPT_CACHE_MAX_BYTES = int(os.environ.get('TRANSCRIPT_CACHE_MAX_BYTES', str(256 * 1024)))
 
 # OpenAI client initialization
 openai_client = None
@@ -60,6 +116,36 @@ except Exception as e:
     print(f"❌ OpenAI client initialization failed: {e}")
     openai_client = None
 
+# Atomically check the (optional) bypass key, then increment the daily counter
+# and set its expiry on the first hit, so the whole rate limit check costs a
+# single round-trip and INCR + EXPIRE can't race each other.
+# Returns -1 if the bypass key exists (counter untouched), else the new count.
+RATE_LIMIT_SCRIPT = """
+if KEYS[2] and redis.call('EXISTS', KEYS[2]) == 1 then
+    return -1
+end
+local count = redis.call('INCR', KEYS[1])
+if count == 1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[1])
+end
+return count
+"""
+RATE_LIMIT_SCRIPT_SHA = hashlib.sha1(RATE_LIMIT_SCRIPT.encode()).hexdigest()
+
+RATE_LIMIT_BYPASSED = -1
+
+def incr_rate_limit_counter(key, ttl, bypass_redis_key=None):
+    """Increment a rate limit counter, setting its TTL if it was just created.
+
+    Returns RATE_LIMIT_BYPASSED instead if bypass_redis_key exists.
+    """
+    keys = [key, bypass_redis_key] if bypass_redis_key else [key]
+    try:
+        return int(redis_client.evalsha(RATE_LIMIT_SCRIPT_SHA, len(keys), *keys, ttl))
+    except redis.exceptions.NoScriptError:
+        # Script cache was flushed (or never loaded); EVAL loads it for next time
+        return int(redis_client.eval(RATE_LIMIT_SCRIPT, len(keys), *keys, ttl))
+
 def get_client_ip():
     """Extract real client IP from X-Forwarded-For header (Heroku) or fallback"""
     forwarded_for = request.headers.get('X-Forwarded-For')
@@ -68,9 +154,26 @@ def get_client_ip():
         return forwarded_for.split(',')[0].strip()
     return request.remote_addr
 
-def get_rate_limit_key(ip):
-    """Generate Redis key for daily rate limiting"""
-    today = datetime.now(timezone.utc).strftime('%Y%m%d')
+def get_rate_limit_window():
+    """Get (today, reset_timestamp, seconds_until_reset) for the current UTC day.
+
+    Computed once per request and cached on flask.g, so the middleware,
+    rate limit check and response headers share a single clock read.
+    """
+    window = g.get('rate_limit_window')
+    if window is None:
+        # UTC days are whole multiples of 86400s since the epoch
+        now = int(time.time())
+        today = now // 86400
+        midnight = (today + 1) * 86400
+        window = (today, midnight, midnight - now)
+        g.rate_limit_window = window
+    return window
+
+def get_rate_limit_key(ip, today=None):
+    """Generate Redis key for daily rate limiting (today = days since epoch, UTC)"""
+    if today is None:
+        today = int(time.time()) // 86400
     return f"rl:ip:{ip}:{today}"
 
 def get_bypass_key():
@@ -82,50 +185,48 @@ def check_rate_limit(ip):
     if not redis_client:
         return True, 0, DAILY_LIMIT  # No Redis = no limiting
 
-    # Check for bypass key first
+    # Bypass key is checked in the same round-trip as the counter
     bypass_key = get_bypass_key()
-    if bypass_key:
-        bypass_exists = redis_client.exists(f"bp:{bypass_key}")
-        if bypass_exists:
-            return True, 0, DAILY_LIMIT  # Bypass active
+    bypass_redis_key = f"bp:{bypass_key}" if bypass_key else None
 
-    key = get_rate_limit_key(ip)
+    # Counter expires at end of day (UTC midnight)
+    today, reset_timestamp, ttl = get_rate_limit_window()
+    key = get_rate_limit_key(ip, today)
 
     try:
-        # Increment counter
-        current_count = redis_client.incr(key)
-
-        # Set expiration to end of day (UTC midnight) if this is the first request
-        if current_count == 1:
-            # Calculate seconds until UTC midnight
-            now = datetime.now(timezone.utc)
-            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            ttl = int((midnight - now).total_seconds())
-            redis_client.expire(key, ttl)
+        # Increment counter (and set expiration if this is the first request)
+        current_count = incr_rate_limit_counter(key, ttl, bypass_redis_key)
+        if current_count == RATE_LIMIT_BYPASSED:
+            g.rate_limit_state = (0, DAILY_LIMIT, reset_timestamp, True)
+            return True, 0, DAILY_LIMIT  # Bypass active
 
         remaining = max(0, DAILY_LIMIT - current_count)
         rate_limited = current_count > DAILY_LIMIT
 
+        # Kept for add_rate_limit_headers so it doesn't have to ask Redis again
+        g.rate_limit_state = (current_count, remaining, reset_timestamp, False)
+
         return not rate_limited, current_count, remaining
 
     except Exception as e:
         print(f"Redis error during rate limiting: {e}")
         return True, 0, DAILY_LIMIT  # Fail open
 
+# Only transcript extraction and summarization are rate limited; every other
+# endpoint (health checks, proxy status, admin, index) never touches Redis here
+RATE_LIMITED_ENDPOINTS = frozenset(['get_transcript', 'summarize_transcript'])
+
 def rate_limit_middleware():
     """Global rate limiting middleware"""
-    # Only apply rate limiting to transcript extraction and summarization
-    if request.endpoint not in ['get_transcript', 'summarize_transcript']:
+    if request.endpoint not in RATE_LIMITED_ENDPOINTS:
         return
 
     ip = get_client_ip()
     allowed, current_count, remaining = check_rate_limit(ip)
 
     if not allowed:
-        # Calculate reset time (next UTC midnight)
-        now = datetime.now(timezone.utc)
-        midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-        reset_timestamp = int(midnight.timestamp())
+        # Reset time (next UTC midnight)
+        _, reset_timestamp, retry_after = get_rate_limit_window()
 
         response = jsonify({
             'error': 'Rate limit exceeded',
@@ -136,67 +237,107 @@ def rate_limit_middleware():
         response.headers['X-RateLimit-Limit'] = str(DAILY_LIMIT)
         response.headers['X-RateLimit-Remaining'] = '0'
         response.headers['X-RateLimit-Reset'] = str(reset_timestamp)
-        response.headers['Retry-After'] = str(int((midnight - now).total_seconds()))
+        response.headers['Retry-After'] = str(retry_after)
 
         return response
 
 def add_rate_limit_headers(response):
     """Add rate limit headers to successful responses"""
-    if not redis_client or response.status_code >= 400:
+    # Only rate limited requests have state (set by check_rate_limit), so
+    # other endpoints, bypassed and fail-open requests never touch Redis here
+    state = g.get('rate_limit_state')
+    if state is None or response.status_code >= 400:
         return response
 
-    # Skip for bypassed requests
-    bypass_key = get_bypass_key()
-    if bypass_key and redis_client.exists(f"bp:{bypass_key}"):
+    current_count, remaining, reset_timestamp, bypassed = state
+    if bypassed:
         return response
 
-    # Only add rate limit headers for specific endpoints
-    if request.endpoint in ['get_transcript', 'summarize_transcript', 'proxy_status']:
-        ip = get_client_ip()
-        key = get_rate_limit_key(ip)
+    response.headers['X-RateLimit-Limit'] = str(DAILY_LIMIT)
+    response.headers['X-RateLimit-Remaining'] = str(remaining)
+    response.headers['X-RateLimit-Reset'] = str(reset_timestamp)
 
-        try:
-            current_count = redis_client.get(key) or 0
-            current_count = int(current_count)
-            remaining = max(0, DAILY_LIMIT - current_count)
-
-            # Calculate reset time
-            now = datetime.now(timezone.utc)
-            midnight = (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
-            reset_timestamp = int(midnight.timestamp())
+    return response
 
-            response.headers['X-RateLimit-Limit'] = str(DAILY_LIMIT)
-            response.headers['X-RateLimit-Remaining'] = str(remaining)
-            response.headers['X-RateLimit-Reset'] = str(reset_timestamp)
+# Gzip JSON responses larger than this (transcripts of long videos run to MBs
+# of highly compressible text; tiny payloads aren't worth the CPU)
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_LEVEL = 5
+
+def compress_response(response):
+    """Gzip JSON responses when the client accepts it"""
+    if (response.status_code != 200
+            or response.direct_passthrough
+            or response.mimetype != 'application/json'
+            or 'Content-Encoding' in response.headers
+            or request.accept_encodings['gzip'] <= 0):  # quality; honours gzip;q=0 and *
+        return response
 
-        except Exception as e:
-            print(f"Error adding rate limit headers: {e}")
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_SIZE:
+        return response
 
+    response.set_data(gzip.compress(data, compresslevel=COMPRESS_LEVEL))
+    response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
     return response
 
 # Register middleware
 app.before_request(rate_limit_middleware)
 app.after_request(add_rate_limit_headers)
-
+app.after_request(compress_response)
+
+# YouTube video IDs are exactly 11 URL-safe base64 characters
+_VIDEO_ID_RE = re.compile(r'[a-zA-Z0-9_-]{11}')
+# Fallback for IDs outside the usual spots (attribution_link?u=/watch?v=ID,
+# legacy youtube.com/#!/watch?v=ID), searched over the whole URL
+_VIDEO_ID_SEARCH_RE = re.compile(r'(?:v=|youtu\.be/|/embed/)([a-zA-Z0-9_-]{11})')
+# A YouTube URL inside surrounding text ("Check this https://youtu.be/ID")
+_YOUTUBE_URL_RE = re.compile(r'(?<![\w.-])(?:https?://)?(?:[\w-]+\.)*(?:youtube\.com|youtu\.be)/\S*')
+_SCHEME_RE = re.compile(r'[a-zA-Z][a-zA-Z0-9+.-]*://')
+# Longest URL accepted (and so memoized by extract_video_id); real YouTube links are far shorter
+MAX_URL_LENGTH = 2048
+
+def _is_youtube_host(host):
+    """Whether host is youtube.com, youtu.be or one of their subdomains"""
+    return host in ('youtube.com', 'youtu.be') or host.endswith(('.youtube.com', '.youtu.be'))
+
+@lru_cache(maxsize=2048)
 def extract_video_id(url):
-    """Extract video ID from various YouTube URL formats"""
-    patterns = [
-        r'(?:youtube\.com/watch\?v=|youtu\.be/|youtube\.com/embed/)([a-zA-Z0-9_-]{11})',
-        r'youtube\.com/.*[?&]v=([a-zA-Z0-9_-]{11})',
-    ]
-
-    for pattern in patterns:
-        match = re.search(pattern, url)
-        if match:
-            return match.group(1)
-    return None
+    """Extract video ID from various YouTube URL formats (memoized for repeat URLs)"""
+    # Parse the URL once and slice the ID out of the known position instead of
+    # regex-scanning the whole string (also tolerates URLs without a scheme)
+    try:
+        parts = urlsplit(url if _SCHEME_RE.match(url) else '//' + url)
+        host = parts.hostname or ''
+    except ValueError:
+        parts, host = None, ''  # e.g. malformed IPv6 netloc
+
+    if not _is_youtube_host(host):
+        # Only YouTube hosts are accepted, but the URL may be embedded in text
+        match = _YOUTUBE_URL_RE.search(url)
+        if match and match.group() != url:
+            return extract_video_id(match.group())
+        return None
+
+    video_id = None
+    if host == 'youtu.be' or host.endswith('.youtu.be'):
+        video_id = parts.path[1:12]
+    elif parts.path.startswith('/embed/'):
+        video_id = parts.path[7:18]
+    else:
+        # watch?v= (or any other youtube.com URL carrying a v= parameter)
+        video_id = parse_qs(parts.query).get('v', [''])[0][:11]
 
-def get_webshare_proxy_config():
-    """Get Webshare proxy configuration from environment variables"""
-    webshare_username = os.environ.get('WEBSHARE_USERNAME')
-    webshare_password = os.environ.get('WEBSHARE_PASSWORD')
-    webshare_countries = os.environ.get('WEBSHARE_COUNTRIES', '').strip()
+    if video_id and _VIDEO_ID_RE.fullmatch(video_id):
+        return video_id
 
+    match = _VIDEO_ID_SEARCH_RE.search(url)
+    return match.group(1) if match else None
+
+@lru_cache(maxsize=4)
+def _build_proxy_config(webshare_username, webshare_password, webshare_countries):
+    """Build Webshare proxy configuration (memoized per distinct set of settings)"""
     if all([webshare_username, webshare_password]):
         # Parse countries filter if provided (comma-separated)
         filter_countries = None
@@ -227,29 +368,84 @@ def get_webshare_proxy_config():
         return config
     return None
 
+def get_webshare_proxy_config():
+    """Get Webshare proxy configuration from environment variables"""
+    return _build_proxy_config(
+        os.environ.get('WEBSHARE_USERNAME'),
+        os.environ.get('WEBSHARE_PASSWORD'),
+        os.environ.get('WEBSHARE_COUNTRIES', '').strip()
+    )
+
+def get_proxy_status():
+    """Return (proxy_enabled, countries) for the current proxy configuration"""
+    proxy_config = get_webshare_proxy_config()
+    countries = []
+    if proxy_config and getattr(proxy_config, '_filter_ip_locations', None):
+        countries = proxy_config._filter_ip_locations
+    return proxy_config is not None, countries
+
+# YouTubeTranscriptApi wraps a requests.Session (with the proxies set on the
+# session itself) and is not safe for concurrent use. Under gevent every request
+# runs in a fresh greenlet, so thread-locals would rebuild it per request;
+# instead each fetch checks an instance out of a small pool and returns it, so
+# instances are reused but never shared by two requests at once.
+TRANSCRIPT_API_POOL_SIZE = 8
+# (proxy config, idle instances); replaced when the proxy config changes
+_transcript_api_pool = (None, queue.LifoQueue(maxsize=TRANSCRIPT_API_POOL_SIZE))
+
+@contextmanager
+def checkout_transcript_api():
+    """Check out a YouTubeTranscriptApi instance, configured with the Webshare proxy if available"""
+    global _transcript_api_pool
+    # _build_proxy_config returns the same object for unchanged settings, so an
+    # identity check is enough to drop pooled instances when the env changes
+    proxy_config = get_webshare_proxy_config()
+    pool_config, pool = _transcript_api_pool
+    if pool_config is not proxy_config:
+        pool = queue.LifoQueue(maxsize=TRANSCRIPT_API_POOL_SIZE)
+        _transcript_api_pool = (proxy_config, pool)
+
+    try:
+        ytt_api = pool.get_nowait()
+    except queue.Empty:
+        if proxy_config:
+            ytt_api = YouTubeTranscriptApi(proxy_config=proxy_config)
+        else:
+            ytt_api = YouTubeTranscriptApi()
+
+    try:
+        yield ytt_api
+    finally:
+        try:
+            pool.put_nowait(ytt_api)
+        except queue.Full:
+            pass  # More concurrent fetches than pooled instances; drop the extra
+
+# index.html has no request-scoped variables, so render it once at startup
+with app.app_context():
+    INDEX_HTML = render_template('index.html')
+
 @app.route('/')
 def index():
-    return render_template('index.html')
+    return INDEX_HTML
+
+# Health payload only depends on startup configuration, so build it once
+HEALTH_STATUS = {
+    'status': 'healthy',
+    'redis_connected': redis_connected,
+    'rate_limiting_enabled': redis_client is not None,
+    'daily_limit': DAILY_LIMIT
+}
 
 @app.route('/health')
 def health():
     """Health check endpoint (bypasses rate limiting)"""
-    return jsonify({
-        'status': 'healthy',
-        'redis_connected': redis_client is not None,
-        'rate_limiting_enabled': redis_client is not None,
-        'daily_limit': DAILY_LIMIT
-    })
+    return jsonify(HEALTH_STATUS)
 
 @app.route('/proxy_status')
 def proxy_status():
     """Get current proxy configuration status"""
-    proxy_config = get_webshare_proxy_config()
-    proxy_enabled = proxy_config is not None
-
-    countries = []
-    if proxy_config and hasattr(proxy_config, '_filter_ip_locations') and proxy_config._filter_ip_locations:
-        countries = proxy_config._filter_ip_locations
+    proxy_enabled, countries = get_proxy_status()
 
     return jsonify({
         'proxy_enabled': proxy_enabled,
@@ -270,27 +466,42 @@ def admin_issue_bypass():
         return jsonify({'error': 'Redis not available'}), 503
 
     try:
-        # Generate secure bypass key
-        bypass_key = secrets.token_urlsafe(32)
-
-        # Get TTL from request (default 12 hours)
+        # Get TTL and optional batch size from request (default 12 hours, 1 key)
         data = request.get_json() or {}
         ttl_hours = data.get('ttl_hours', 12)
         ttl_seconds = ttl_hours * 3600
 
-        # Store bypass key in Redis with expiration
-        redis_key = f"bp:{bypass_key}"
-        redis_client.setex(redis_key, ttl_seconds, "1")
+        count = data.get('count', 1)
+        if not isinstance(count, int) or isinstance(count, bool) or not 1 <= count <= MAX_BYPASS_BATCH:
+            return jsonify({'error': f'count must be an integer between 1 and {MAX_BYPASS_BATCH}'}), 400
+
+        # Generate secure bypass keys (same format as secrets.token_urlsafe(32))
+        # from a single urandom read
+        raw = os.urandom(32 * count)
+        bypass_keys = [
+            base64.urlsafe_b64encode(raw[i * 32:(i + 1) * 32]).rstrip(b'=').decode()
+            for i in range(count)
+        ]
+
+        # Store bypass keys in Redis with expiration, in one round-trip
+        pipe = redis_client.pipeline(transaction=False)
+        for bypass_key in bypass_keys:
+            pipe.setex(f"bp:{bypass_key}", ttl_seconds, "1")
+        pipe.execute()
 
         # Calculate expiration timestamp
         expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)
 
-        return jsonify({
+        result = {
             'success': True,
-            'bypass_key': bypass_key,
+            'bypass_key': bypass_keys[0],
             'expires_at': expires_at.isoformat(),
             'ttl_seconds': ttl_seconds
-        })
+        }
+        if 'count' in data:
+            result['bypass_keys'] = bypass_keys
+
+        return jsonify(result)
 
     except Exception as e:
         return jsonify({'error': f'Failed to issue bypass: {str(e)}'}), 500
@@ -400,6 +611,97 @@ def admin_reset_rate_limit():
     except Exception as e:
         return jsonify({'error': f'Failed to reset rate limit: {str(e)}'}), 500
 
+def ttl_lru_cache(maxsize, ttl):
+    """Like lru_cache, but entries also expire ttl seconds after they were stored"""
+    def decorator(func):
+        cache = OrderedDict()  # args -> (stored_at, value), least recent first
+        lock = threading.Lock()
+
+        @wraps(func)
+        def wrapper(*args):
+            with lock:
+                entry = cache.get(args)
+                if entry is not None and time.monotonic() - entry[0] < ttl:
+                    cache.move_to_end(args)
+                    return entry[1]
+
+            value = func(*args)
+            if maxsize > 0 and ttl > 0:
+                with lock:
+                    cache[args] = (time.monotonic(), value)
+                    cache.move_to_end(args)
+                    while len(cache) > maxsize:
+                        cache.popitem(last=False)
+            return value
+
+        wrapper.cache_clear = cache.clear
+        return wrapper
+    return decorator
+
+@ttl_lru_cache(maxsize=TRANSCRIPT_CACHE_SIZE, ttl=TRANSCRIPT_MEMORY_TTL)
+def fetch_transcript(video_id):
+    """Get (formatted_transcript, full_text) for a video.
+
+    Transcripts rarely change, so lookups go through an in-process LRU cache
+    (this decorator, entries expire after TRANSCRIPT_MEMORY_TTL), then a
+    shared Redis cache, and only then to YouTube.
+    """
+    cache_key = f"tx:{video_id}"
+    use_redis = redis_client is not None and TRANSCRIPT_CACHE_TTL > 0
+    if use_redis:
+        try:
+            cached = redis_client.get(cache_key)
+            if cached:
+                # Only the snippets are stored; full_text is rebuilt from them
+                formatted_transcript = orjson.loads(cached)
+                return formatted_transcript, ' '.join(entry['text'] for entry in formatted_transcript)
+        except Exception as e:
+            print(f"Redis error reading transcript cache: {e}")
+
+    # Get transcript using the correct API for version 1.2.2
+    try:
+        # Borrow a pooled YouTubeTranscriptApi instead of building one per request
+        with checkout_transcript_api() as ytt_api:
+            # List available transcripts once, then pick by language preference
+            # (ytt_api.fetch() would list again on the fallback path)
+            transcript_list_obj = ytt_api.list(video_id)
+            try:
+                transcript = transcript_list_obj.find_transcript(['en', 'en-US', 'en-GB'])
+            except NoTranscriptFound:
+                # If specific languages fail, try to get any available transcript
+                transcript = next(iter(transcript_list_obj))
+            fetched_transcript = transcript.fetch()
+        transcript_list = fetched_transcript.snippets
+
+    except Exception as e:
+        raise Exception(f"Could not retrieve transcript: {str(e)}")
+
+    # Format transcript - transcript_list contains FetchedTranscriptSnippet objects
+    # (single pass builds both the formatted list and the full text pieces)
+    formatted_transcript = []
+    texts = []
+    for entry in transcript_list:
+        text = entry.text
+        texts.append(text)
+        formatted_transcript.append({
+            'start': entry.start,
+            'duration': entry.duration,
+            'text': text
+        })
+
+    # Create full text version
+    full_text = ' '.join(texts)
+
+    if use_redis:
+        payload = orjson.dumps(formatted_transcript)
+        if len(payload) <= TRANSCRIPT_CACHE_MAX_BYTES:
+            try:
+                redis_client.setex(cache_key, TRANSCRIPT_CACHE_TTL, payload)
+            except Exception as e:
+                print(f"Redis error writing transcript cache: {e}")
+
+    return formatted_transcript, full_text
+
 @app.route('/get_transcript', methods=['POST'])
 def get_transcript():
     try:
@@ -409,50 +711,16 @@ def get_transcript():
         if not youtube_url:
             return jsonify({'error': 'Please provide a YouTube URL'}), 400
 
+        if len(youtube_url) > MAX_URL_LENGTH:
+            return jsonify({'error': 'Invalid YouTube URL'}), 400
+
         video_id = extract_video_id(youtube_url)
         if not video_id:
             return jsonify({'error': 'Invalid YouTube URL'}), 400
 
-        # Configure Webshare proxy if available
-        proxy_config = get_webshare_proxy_config()
-        proxy_enabled = proxy_config is not None
-        countries = []
-        if proxy_config and hasattr(proxy_config, '_filter_ip_locations') and proxy_config._filter_ip_locations:
-            countries = proxy_config._filter_ip_locations
+        proxy_enabled, countries = get_proxy_status()
 
-        # Get transcript using the correct API for version 1.2.2
-        try:
-            # Create YouTubeTranscriptApi instance with optional proxy
-            if proxy_config:
-                ytt_api = YouTubeTranscriptApi(proxy_config=proxy_config)
-            else:
-                ytt_api = YouTubeTranscriptApi()
-
-            # Try to fetch transcript directly with language preferences
-            try:
-                fetched_transcript = ytt_api.fetch(video_id, languages=['en', 'en-US', 'en-GB'])
-                transcript_list = fetched_transcript.snippets
-            except:
-                # If specific languages fail, try to get any available transcript
-                transcript_list_obj = ytt_api.list(video_id)
-                transcript = next(iter(transcript_list_obj))
-                fetched_transcript = transcript.fetch()
-                transcript_list = fetched_transcript.snippets
-
-        except Exception as e:
-            raise Exception(f"Could not retrieve transcript: {str(e)}")
-
-        # Format transcript - transcript_list contains FetchedTranscriptSnippet objects
-        formatted_transcript = []
-        for entry in transcript_list:
-            formatted_transcript.append({
-                'start': entry.start,
-                'duration': entry.duration,
-                'text': entry.text
-            })
-
-        # Create full text version
-        full_text = ' '.join([entry.text for entry in transcript_list])
+        formatted_transcript, full_text = fetch_transcript(video_id)
 
         return jsonify({
             'success': True,
@@ -479,10 +747,11 @@ def summarize_transcript():
         if not transcript_text:
             return jsonify({'error': 'Please provide transcript text to summarize'}), 400
 
-        # Limit transcript length (OpenAI has token limits)
+        # Limit transcript length (OpenAI has token limits); the slice and the
+        # "..." marker go straight into the prompt below, so short transcripts
+        # (the common case) are never copied here
         max_chars = 30000  # Approximately 7500 tokens
-        if len(transcript_text) > max_chars:
-            transcript_text = transcript_text[:max_chars] + "..."
+        truncated = len(transcript_text) > max_chars
 
         # Create summarization prompt
         system_prompt = """You are an expert at summarizing YouTube video transcripts. 
@@ -495,7 +764,10 @@ Please provide:
 
 Keep the summary concise but comprehensive."""
 
-        user_prompt = f"Please summarize this YouTube transcript:\n\n{transcript_text}"
+        if truncated:
+            user_prompt = f"Please summarize this YouTube transcript:\n\n{transcript_text[:max_chars]}..."
+        else:
+            user_prompt = f"Please summarize this YouTube transcript:\n\n{transcript_text}"
 
         # Call OpenAI API
         try:
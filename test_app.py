@@ -4,18 +4,63 @@ Comprehensive test script for the YouTube Transcript Extractor API
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import os
+import socket
 import sys
 import traceback
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
 
-# Configuration
-BASE_URL = "http://127.0.0.1:8000"
+try:
+    import aiohttp  # Optional: enables async fan-out of transcript tests
+except ImportError:
+    aiohttp = None
+
+try:
+    import httpx  # Optional: enables the --httpx (HTTP/2) transcript test runner
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401 - required by httpx for HTTP/2 (pip install httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Fast JSON encoding/decoding (orjson raises a json.JSONDecodeError subclass on bad input)
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj).encode()
+
+# Configuration (BASE_URL can point at a deployed instance; httpx only
+# negotiates HTTP/2 over TLS, so --httpx multiplexes only with an https:// URL)
+BASE_URL = os.environ.get("BASE_URL", "http://127.0.0.1:8000")
+_base = urlsplit(BASE_URL)
+SERVER_ADDR = (_base.hostname, _base.port or (443 if _base.scheme == "https" else 80))
 TEST_URLS = [
     "https://www.youtube.com/watch?v=8jPQjjsBbIc",  # 3Blue1Brown - Linear algebra
     "https://www.youtube.com/watch?v=aircAruvnKk",  # 3Blue1Brown - Neural networks
     "https://youtu.be/aircAruvnKk",                # Short format
     "invalid-url",                                  # Invalid URL test
 ]
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Request bodies for the static URL list, serialized once up front
+PAYLOADS = {url: _dumps({"url": url}) for url in TEST_URLS}
+
+# Shared session so all tests reuse pooled keep-alive connections to the server
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
 
 def test_imports():
     """Test that the Flask app imports work correctly"""
@@ -41,63 +86,153 @@ def test_imports():
         return True
     except Exception as e:
         print(f"❌ Import error: {e}")
-        traceback.print_exc()
+        if "-v" in sys.argv or os.environ.get("VERBOSE"):
+            traceback.print_exc()
         return False
 
+def get_payload(url):
+    """Get the pre-serialized /get_transcript request body for a URL"""
+    payload = PAYLOADS.get(url)
+    if payload is None:
+        payload = _dumps({"url": url})
+    return payload
+
+def report_transcript_response(log, status_code, data, text):
+    """Log the outcome of a /get_transcript call (data is the parsed JSON body, or None)"""
+    log(f"Status Code: {status_code}")
+    
+    if status_code == 200 and data is not None:
+        if data.get('success'):
+            entries = data['transcript']
+            full_text = data['full_text']
+            
+            log("✅ SUCCESS")
+            log(f"Video ID: {data['video_id']}")
+            log(f"Transcript entries: {len(entries)}")
+            log(f"Full text length: {len(full_text)} characters")
+            
+            # Show first few transcript entries
+            log("\nFirst 3 transcript entries:")
+            log("\n".join(
+                f"  {i+1}. [{entry['start']:.1f}s] {entry['text']}"
+                for i, entry in enumerate(entries[:3])
+            ))
+            
+            # Show first 200 characters of full text
+            log(f"\nFirst 200 characters:")
+            log(f"  {full_text[:200]}...")
+            
+        else:
+            log("❌ API returned success=False")
+            log(f"Error: {data.get('error', 'Unknown error')}")
+    else:
+        log("❌ HTTP ERROR")
+        if data is not None:
+            log(f"Error: {data.get('error', 'Unknown error')}")
+        else:
+            log(f"Raw response: {text}")
+
 def test_transcript_extraction(url):
     """Test transcript extraction for a given URL"""
-    print(f"\n{'='*60}")
-    print(f"Testing URL: {url}")
-    print('='*60)
+    # Buffer output and print it in one go so concurrent runs don't interleave
+    out = []
+    log = out.append
+    
+    log(f"\n{'='*60}")
+    log(f"Testing URL: {url}")
+    log('='*60)
     
     try:
-        response = requests.post(
+        response = SESSION.post(
             f"{BASE_URL}/get_transcript",
-            json={"url": url},
-            headers={"Content-Type": "application/json"}
+            data=get_payload(url),
+            headers=JSON_HEADERS
         )
         
-        print(f"Status Code: {response.status_code}")
-        
-        if response.status_code == 200:
-            data = response.json()
-            if data.get('success'):
-                print("✅ SUCCESS")
-                print(f"Video ID: {data['video_id']}")
-                print(f"Transcript entries: {len(data['transcript'])}")
-                print(f"Full text length: {len(data['full_text'])} characters")
-                
-                # Show first few transcript entries
-                print("\nFirst 3 transcript entries:")
-                for i, entry in enumerate(data['transcript'][:3]):
-                    print(f"  {i+1}. [{entry['start']:.1f}s] {entry['text']}")
-                
-                # Show first 200 characters of full text
-                print(f"\nFirst 200 characters:")
-                print(f"  {data['full_text'][:200]}...")
-                
-            else:
-                print("❌ API returned success=False")
-                print(f"Error: {data.get('error', 'Unknown error')}")
-        else:
-            print("❌ HTTP ERROR")
-            try:
-                error_data = response.json()
-                print(f"Error: {error_data.get('error', 'Unknown error')}")
-            except:
-                print(f"Raw response: {response.text}")
+        try:
+            data = _loads(response.content)
+        except ValueError:
+            data = None
+        report_transcript_response(log, response.status_code, data, response.text)
                 
     except requests.exceptions.ConnectionError:
-        print("❌ CONNECTION ERROR")
-        print("Make sure the Flask app is running on http://127.0.0.1:8000")
+        log("❌ CONNECTION ERROR")
+        log(f"Make sure the Flask app is running on {BASE_URL}")
+    except Exception as e:
+        log(f"❌ UNEXPECTED ERROR: {e}")
+    finally:
+        print('\n'.join(out))
+
+async def atest_transcript_extraction(post, url):
+    """Async variant of test_transcript_extraction; post(url) returns (status_code, text)"""
+    out = []
+    log = out.append
+    
+    log(f"\n{'='*60}")
+    log(f"Testing URL: {url}")
+    log('='*60)
+    
+    try:
+        status_code, text = await post(url)
+        
+        try:
+            data = _loads(text)
+        except ValueError:
+            data = None
+        report_transcript_response(log, status_code, data, text)
+    
+    except ConnectionError:
+        log("❌ CONNECTION ERROR")
+        log(f"Make sure the Flask app is running on {BASE_URL}")
     except Exception as e:
-        print(f"❌ UNEXPECTED ERROR: {e}")
+        log(f"❌ UNEXPECTED ERROR: {e}")
+    finally:
+        print('\n'.join(out))
+
+async def run_transcript_tests_async(urls):
+    """Fan out transcript tests over one pooled aiohttp session"""
+    connector = aiohttp.TCPConnector(limit=16, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async def post(url):
+            try:
+                async with session.post(f"{BASE_URL}/get_transcript", data=get_payload(url),
+                                        headers=JSON_HEADERS) as response:
+                    return response.status, await response.text()
+            except aiohttp.ClientConnectionError as e:
+                raise ConnectionError(e) from e
+        
+        await asyncio.gather(*[atest_transcript_extraction(post, url) for url in urls])
+
+async def run_transcript_tests_httpx(urls):
+    """Fan out transcript tests over one httpx client (HTTP/2 multiplexed for https:// with h2 installed)"""
+    limits = httpx.Limits(max_connections=8, max_keepalive_connections=8)
+    async with httpx.AsyncClient(http2=HTTP2_AVAILABLE, base_url=BASE_URL,
+                                 limits=limits, timeout=60) as client:
+        async def post(url):
+            try:
+                response = await client.post("/get_transcript", content=get_payload(url),
+                                             headers=JSON_HEADERS)
+            except httpx.ConnectError as e:
+                raise ConnectionError(e) from e
+            return response.status_code, response.text
+        
+        await asyncio.gather(*[atest_transcript_extraction(post, url) for url in urls])
 
 def test_server_health():
-    """Test if the server is running"""
+    """Test if the server is running (TCP connect; full HTTP GET with --deep)"""
     print("Testing server health...")
+    if "--deep" not in sys.argv:
+        try:
+            socket.create_connection(SERVER_ADDR, timeout=0.5).close()
+            print("✅ Server is running")
+            return True
+        except OSError:
+            print("❌ Cannot connect to server")
+            print("Make sure to run: source venv/bin/activate && PORT=8000 python app.py")
+            return False
+    
     try:
-        response = requests.get(BASE_URL)
+        response = SESSION.get(BASE_URL)
         if response.status_code == 200:
             print("✅ Server is running and responding")
             return True
@@ -113,14 +248,14 @@ def test_proxy_status_endpoint():
     """Test the proxy status endpoint specifically"""
     print("\nTesting /proxy_status endpoint...")
     try:
-        response = requests.get(f"{BASE_URL}/proxy_status", timeout=10)
+        response = SESSION.get(f"{BASE_URL}/proxy_status", timeout=10)
         print(f"Status Code: {response.status_code}")
         print(f"Content-Type: {response.headers.get('content-type', 'unknown')}")
         print(f"Response length: {len(response.text)} chars")
         
         if response.status_code == 200:
             try:
-                data = response.json()
+                data = _loads(response.content)
                 print("✅ Valid JSON response")
                 print(f"Proxy enabled: {data.get('proxy_enabled')}")
                 print(f"Countries: {data.get('countries')}")
@@ -143,20 +278,23 @@ def test_rate_limiting():
     
     # Test health endpoint (should not be rate limited)
     try:
-        response = requests.get(f"{BASE_URL}/health", timeout=10)
+        response = SESSION.get(f"{BASE_URL}/health", timeout=10)
         print(f"Health endpoint: {response.status_code}")
         if response.status_code == 200:
-            data = response.json()
+            data = _loads(response.content)
             print(f"Rate limiting enabled: {data.get('rate_limiting_enabled')}")
             print(f"Daily limit: {data.get('daily_limit')}")
         
         # Check if we have rate limit headers
-        headers = response.headers
-        if 'X-RateLimit-Limit' in headers:
+        h = response.headers
+        limit, remaining, reset = (
+            h.get('X-RateLimit-Limit'), h.get('X-RateLimit-Remaining'), h.get('X-RateLimit-Reset')
+        )
+        if limit is not None:
             print(f"Rate limit headers present:")
-            print(f"  Limit: {headers.get('X-RateLimit-Limit')}")
-            print(f"  Remaining: {headers.get('X-RateLimit-Remaining')}")
-            print(f"  Reset: {headers.get('X-RateLimit-Reset')}")
+            print(f"  Limit: {limit}")
+            print(f"  Remaining: {remaining}")
+            print(f"  Reset: {reset}")
         else:
             print("No rate limit headers (Redis likely not connected)")
             
@@ -172,7 +310,7 @@ def test_admin_endpoints():
     
     # Test without admin token
     try:
-        response = requests.post(f"{BASE_URL}/admin/issue_bypass", timeout=10)
+        response = SESSION.post(f"{BASE_URL}/admin/issue_bypass", timeout=10)
         print(f"Issue bypass without token: {response.status_code}")
         
         if response.status_code == 401:
@@ -212,9 +350,17 @@ def main():
     print(f"\nTesting transcript extraction with {len(TEST_URLS)} URLs:")
     print("⚠️  Note: These requests count against your daily rate limit")
     
-    for i, url in enumerate(TEST_URLS[:2]):  # Limit to 2 tests to avoid hitting rate limit
-        print(f"\nTest {i+1}/{min(2, len(TEST_URLS))}:")
-        test_transcript_extraction(url)
+    # Run the URLs concurrently: httpx with --httpx (HTTP/2 when BASE_URL is an
+    # https:// server or proxy that negotiates it), asyncio + aiohttp when
+    # available, otherwise (or with --sync) a thread pool over the shared SESSION
+    urls = TEST_URLS[:2]  # Limit to 2 tests to avoid hitting rate limit
+    if httpx is not None and "--httpx" in sys.argv:
+        asyncio.run(run_transcript_tests_httpx(urls))
+    elif aiohttp is not None and "--sync" not in sys.argv:
+        asyncio.run(run_transcript_tests_async(urls))
+    else:
+        with ThreadPoolExecutor(max_workers=min(8, len(urls))) as executor:
+            list(executor.map(test_transcript_extraction, urls))
     
     print(f"\n{'='*60}")
     print("Test suite completed!")
@@ -7,12 +7,51 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import json
 import os
+from types import SimpleNamespace as NS
 from datetime import datetime, timezone, timedelta
 import sys
 
+# Fast JSON decoding for response bodies
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
 # Add the current directory to Python path so we can import app
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+# Test configuration (applied once for the whole module)
+TEST_ENV = {
+    'DAILY_LIMIT': '5',
+    'ADMIN_TOKEN': 'test_token'
+}
+
+app = None
+_config_patch = None
+
+def setUpModule():
+    """Import app once with the test configuration"""
+    global app, _config_patch
+    with patch.dict(os.environ, TEST_ENV):
+        import app as app_module
+    app = app_module
+    
+    # Module-level config is read at import time; pin it in case app was
+    # already imported elsewhere (e.g. by another test module)
+    _config_patch = patch.multiple(app, DAILY_LIMIT=int(TEST_ENV['DAILY_LIMIT']),
+                                   ADMIN_TOKEN=TEST_ENV['ADMIN_TOKEN'])
+    _config_patch.start()
+
+def tearDownModule():
+    """Restore app configuration"""
+    _config_patch.stop()
+
+def _stub_transcript(mock_checkout, snippets):
+    """Make the mocked transcript API return these snippets for the preferred language"""
+    transcript_list = mock_checkout.return_value.__enter__.return_value.list.return_value
+    transcript_list.find_transcript.return_value.fetch.return_value = NS(snippets=snippets)
+
 class TestRateLimiting(unittest.TestCase):
     """Test rate limiting functionality"""
     
@@ -21,17 +60,9 @@ class TestRateLimiting(unittest.TestCase):
         # Mock Redis client
         self.mock_redis = Mock()
         
-        # Import app module with mocked Redis
-        with patch('app.redis') as mock_redis_module:
-            with patch.dict(os.environ, {
-                'REDIS_URL': 'redis://localhost:6379',
-                'DAILY_LIMIT': '5',
-                'ADMIN_TOKEN': 'test_token'
-            }):
-                import app
-                self.app_module = app
-                self.app_module.redis_client = self.mock_redis
-                self.app = app.app.test_client()
+        self.app_module = app
+        self.app_module.redis_client = self.mock_redis
+        self.app = app.app.test_client()
     
     def test_get_client_ip_with_forwarded_header(self):
         """Test IP extraction from X-Forwarded-For header"""
@@ -50,10 +81,37 @@ class TestRateLimiting(unittest.TestCase):
     def test_rate_limit_key_generation(self):
         """Test rate limit key generation"""
         test_ip = '192.168.1.1'
-        with patch('app.datetime') as mock_datetime:
-            mock_datetime.now.return_value.strftime.return_value = '20250816'
+        # 2025-08-16 12:00:00 UTC is day 20316 since the epoch
+        with patch('app.time.time', return_value=1755345600.0):
             key = self.app_module.get_rate_limit_key(test_ip)
-            self.assertEqual(key, 'rl:ip:192.168.1.1:20250816')
+            self.assertEqual(key, 'rl:ip:192.168.1.1:20316')
+    
+    def test_check_rate_limit_uses_integer_day_key(self):
+        """Test the counter key and TTL come from the same integer-day window"""
+        self.mock_redis.evalsha.return_value = 1
+        
+        with self.app_module.app.test_request_context():
+            # 2025-08-16 12:00:00 UTC
+            with patch('app.time.time', return_value=1755345600.0):
+                self.app_module.check_rate_limit('192.168.1.1')
+        
+        _, numkeys, key, ttl = self.mock_redis.evalsha.call_args[0]
+        self.assertEqual(numkeys, 1)
+        self.assertEqual(key, 'rl:ip:192.168.1.1:20316')
+        self.assertEqual(ttl, 12 * 3600)
+    
+    def test_rate_limit_window_computed_once_per_request(self):
+        """Test the UTC day window is cached for the duration of a request"""
+        with self.app_module.app.test_request_context():
+            # 2025-08-16 12:00:00 UTC
+            with patch('app.time.time', return_value=1755345600.0) as mock_time:
+                first = self.app_module.get_rate_limit_window()
+                second = self.app_module.get_rate_limit_window()
+            
+        self.assertEqual(first, second)
+        mock_time.assert_called_once()
+        midnight = int(datetime(2025, 8, 17, tzinfo=timezone.utc).timestamp())
+        self.assertEqual(first, (20316, midnight, 12 * 3600))
     
     def test_check_rate_limit_no_redis(self):
         """Test rate limiting when Redis is unavailable"""
@@ -65,7 +123,7 @@ class TestRateLimiting(unittest.TestCase):
     
     def test_check_rate_limit_first_request(self):
         """Test rate limiting for first request"""
-        self.mock_redis.incr.return_value = 1
+        self.mock_redis.evalsha.return_value = 1
         self.mock_redis.exists.return_value = False
         
         with self.app_module.app.test_request_context():
@@ -74,12 +132,26 @@ class TestRateLimiting(unittest.TestCase):
         self.assertTrue(allowed)
         self.assertEqual(current, 1)
         self.assertEqual(remaining, 4)
-        self.mock_redis.incr.assert_called_once()
-        self.mock_redis.expire.assert_called_once()
+        # INCR + EXPIRE happen server-side in a single script call
+        self.mock_redis.evalsha.assert_called_once()
+        self.mock_redis.incr.assert_not_called()
+        self.mock_redis.expire.assert_not_called()
+    
+    def test_check_rate_limit_script_not_loaded(self):
+        """Test rate limiting falls back to EVAL when the script is not cached"""
+        self.mock_redis.evalsha.side_effect = self.app_module.redis.exceptions.NoScriptError()
+        self.mock_redis.eval.return_value = 3
+        
+        with self.app_module.app.test_request_context():
+            allowed, current, remaining = self.app_module.check_rate_limit('192.168.1.1')
+            
+        self.assertTrue(allowed)
+        self.assertEqual(current, 3)
+        self.mock_redis.eval.assert_called_once()
     
     def test_check_rate_limit_exceeded(self):
         """Test rate limiting when limit is exceeded"""
-        self.mock_redis.incr.return_value = 6  # Over limit of 5
+        self.mock_redis.evalsha.return_value = 6  # Over limit of 5
         self.mock_redis.exists.return_value = False
         
         with self.app_module.app.test_request_context():
@@ -88,10 +160,11 @@ class TestRateLimiting(unittest.TestCase):
         self.assertFalse(allowed)
         self.assertEqual(current, 6)
         self.assertEqual(remaining, 0)
+        self.mock_redis.evalsha.assert_called_once()
     
     def test_bypass_key_functionality(self):
         """Test bypass key bypasses rate limiting"""
-        self.mock_redis.exists.return_value = True  # Bypass key exists
+        self.mock_redis.evalsha.return_value = -1  # Bypass key exists
         
         with self.app_module.app.test_request_context(
             headers={'X-Bypass-Key': 'test_bypass_key'}
@@ -101,14 +174,16 @@ class TestRateLimiting(unittest.TestCase):
         self.assertTrue(allowed)
         self.assertEqual(current, 0)
         self.assertEqual(remaining, 5)
-        self.mock_redis.exists.assert_called_with('bp:test_bypass_key')
+        # Bypass check is batched with the counter in one call
+        self.mock_redis.evalsha.assert_called_once()
+        self.assertIn('bp:test_bypass_key', self.mock_redis.evalsha.call_args[0])
+        self.mock_redis.exists.assert_not_called()
 
 class TestVideoIdExtraction(unittest.TestCase):
     """Test YouTube video ID extraction"""
     
     def setUp(self):
         """Set up test environment"""
-        import app
         self.app_module = app
     
     def test_youtube_watch_url(self):
@@ -135,6 +210,62 @@ class TestVideoIdExtraction(unittest.TestCase):
         video_id = self.app_module.extract_video_id(url)
         self.assertEqual(video_id, "dQw4w9WgXcQ")
     
+    def test_youtube_url_with_v_not_first(self):
+        """Test YouTube URL where v is not the first query parameter"""
+        url = "https://www.youtube.com/watch?feature=share&v=dQw4w9WgXcQ"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertEqual(video_id, "dQw4w9WgXcQ")
+    
+    def test_youtube_url_without_scheme(self):
+        """Test YouTube URLs without a scheme"""
+        self.assertEqual(self.app_module.extract_video_id("youtube.com/watch?v=dQw4w9WgXcQ"), "dQw4w9WgXcQ")
+        self.assertEqual(self.app_module.extract_video_id("m.youtube.com/watch?v=dQw4w9WgXcQ"), "dQw4w9WgXcQ")
+        self.assertEqual(self.app_module.extract_video_id("youtu.be/dQw4w9WgXcQ?si=abc"), "dQw4w9WgXcQ")
+    
+    def test_youtube_url_with_v_in_fragment(self):
+        """Test legacy YouTube URLs carrying v= in the fragment"""
+        url = "https://www.youtube.com/#!/watch?v=dQw4w9WgXcQ"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertEqual(video_id, "dQw4w9WgXcQ")
+    
+    def test_youtube_attribution_link(self):
+        """Test v= nested inside another query parameter"""
+        url = "https://www.youtube.com/attribution_link?a=x&u=/watch?v=dQw4w9WgXcQ&feature=share"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertEqual(video_id, "dQw4w9WgXcQ")
+    
+    def test_youtube_url_without_scheme_containing_url(self):
+        """Test scheme-less URLs whose query carries another URL"""
+        url = "youtube.com/watch?v=dQw4w9WgXcQ&feature=http://x"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertEqual(video_id, "dQw4w9WgXcQ")
+    
+    def test_youtube_url_in_text(self):
+        """Test a YouTube URL pasted with surrounding text"""
+        url = "Check this https://youtu.be/dQw4w9WgXcQ"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertEqual(video_id, "dQw4w9WgXcQ")
+    
+    def test_lookalike_youtube_host(self):
+        """Test hosts that merely contain youtube.com are rejected"""
+        for url in ("https://notyoutube.com/watch?v=dQw4w9WgXcQ",
+                    "https://youtube.com.evil.com/watch?v=dQw4w9WgXcQ"):
+            self.assertIsNone(self.app_module.extract_video_id(url))
+    
+    def test_non_youtube_host(self):
+        """Test URLs on other hosts are rejected even with a v parameter"""
+        url = "https://example.com/watch?v=dQw4w9WgXcQ"
+        video_id = self.app_module.extract_video_id(url)
+        self.assertIsNone(video_id)
+    
+    def test_repeat_url_is_cached(self):
+        """Test repeated URLs are served from the cache"""
+        self.app_module.extract_video_id.cache_clear()
+        url = "https://www.youtube.com/watch?v=dQw4w9WgXcQ"
+        self.app_module.extract_video_id(url)
+        self.assertEqual(self.app_module.extract_video_id(url), "dQw4w9WgXcQ")
+        self.assertEqual(self.app_module.extract_video_id.cache_info().hits, 1)
+    
     def test_invalid_url(self):
         """Test invalid URL returns None"""
         url = "https://example.com/invalid"
@@ -152,7 +283,6 @@ class TestWebshareProxyConfig(unittest.TestCase):
     
     def setUp(self):
         """Set up test environment"""
-        import app
         self.app_module = app
     
     @patch.dict(os.environ, {
@@ -178,33 +308,124 @@ class TestWebshareProxyConfig(unittest.TestCase):
         self.assertEqual(config.proxy_username, 'test_user')
         self.assertEqual(config.proxy_password, 'test_pass')
     
+    @patch.dict(os.environ, {
+        'WEBSHARE_USERNAME': 'test_user',
+        'WEBSHARE_PASSWORD': 'test_pass'
+    }, clear=True)
+    def test_webshare_config_is_cached(self):
+        """Test Webshare config is built once and reused"""
+        first = self.app_module.get_webshare_proxy_config()
+        second = self.app_module.get_webshare_proxy_config()
+        self.assertIs(first, second)
+    
+    def test_webshare_config_follows_env_changes(self):
+        """Test the config cache is keyed on the environment values"""
+        with patch.dict(os.environ, {'WEBSHARE_USERNAME': 'user_a', 'WEBSHARE_PASSWORD': 'pass'}, clear=True):
+            config_a = self.app_module.get_webshare_proxy_config()
+        with patch.dict(os.environ, {'WEBSHARE_USERNAME': 'user_b', 'WEBSHARE_PASSWORD': 'pass'}, clear=True):
+            config_b = self.app_module.get_webshare_proxy_config()
+        
+        self.assertEqual(config_a.proxy_username, 'user_a')
+        self.assertEqual(config_b.proxy_username, 'user_b')
+    
     @patch.dict(os.environ, {}, clear=True)
     def test_webshare_config_missing_credentials(self):
         """Test Webshare config with missing credentials"""
         config = self.app_module.get_webshare_proxy_config()
         self.assertIsNone(config)
 
+class TestTranscriptApiReuse(unittest.TestCase):
+    """Test YouTubeTranscriptApi instance pooling"""
+    
+    def setUp(self):
+        """Set up test environment"""
+        self.app_module = app
+    
+    def checkout(self):
+        """Check an instance out and straight back in"""
+        with self.app_module.checkout_transcript_api() as ytt_api:
+            return ytt_api
+    
+    def test_transcript_api_reused_after_return(self):
+        """Test a returned instance is handed to the next checkout"""
+        self.assertIs(self.checkout(), self.checkout())
+    
+    def test_transcript_api_reused_across_sequential_greenlets(self):
+        """Test requests in successive gevent greenlets share a pooled instance"""
+        try:
+            import gevent
+        except ImportError:
+            self.skipTest('gevent not installed')
+        
+        def request():
+            with self.app_module.checkout_transcript_api() as ytt_api:
+                gevent.sleep(0)  # Yield like a real network fetch would
+                return ytt_api
+        
+        instances = {id(gevent.spawn(request).get()) for _ in range(4)}
+        self.assertEqual(len(instances), 1)
+    
+    def test_transcript_api_not_shared_by_concurrent_greenlets(self):
+        """Test overlapping requests never hold the same instance at once"""
+        try:
+            import gevent
+        except ImportError:
+            self.skipTest('gevent not installed')
+        
+        def request():
+            with self.app_module.checkout_transcript_api() as ytt_api:
+                gevent.sleep(0.01)  # Still checked out while the others start
+                return ytt_api
+        
+        greenlets = [gevent.spawn(request) for _ in range(4)]
+        gevent.joinall(greenlets, raise_error=True)
+        self.assertEqual(len({id(greenlet.value) for greenlet in greenlets}), 4)
+    
+    @patch('app.YouTubeTranscriptApi')
+    def test_transcript_api_rebuilt_on_proxy_change(self, mock_api_cls):
+        """Test a changed Webshare configuration replaces the pooled instances"""
+        mock_api_cls.side_effect = lambda **kwargs: Mock()
+        with patch.dict(os.environ, {'WEBSHARE_USERNAME': 'user_a', 'WEBSHARE_PASSWORD': 'pass'}):
+            first = self.checkout()
+            self.assertIs(self.checkout(), first)
+            config_a = mock_api_cls.call_args.kwargs['proxy_config']
+        
+        with patch.dict(os.environ, {'WEBSHARE_USERNAME': 'user_b', 'WEBSHARE_PASSWORD': 'pass'}):
+            second = self.checkout()
+            config_b = mock_api_cls.call_args.kwargs['proxy_config']
+        
+        self.assertIsNot(second, first)
+        self.assertIsNot(config_b, config_a)
+        self.assertEqual(mock_api_cls.call_count, 2)
+
 class TestAPIEndpoints(unittest.TestCase):
     """Test API endpoints"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for the whole class"""
+        cls.app = app.app.test_client()
+    
     def setUp(self):
         """Set up test environment"""
-        with patch.dict(os.environ, {
-            'REDIS_URL': 'redis://localhost:6379',
-            'DAILY_LIMIT': '5',
-            'ADMIN_TOKEN': 'test_token'
-        }):
-            import app
-            self.app_module = app
-            self.app = app.app.test_client()
-            self.app_module.redis_client = Mock()
+        self.app_module = app
+        self.app_module.redis_client = Mock()
+        self.app_module.redis_client.get.return_value = None  # Transcript cache miss
+        self.app_module.fetch_transcript.cache_clear()
+    
+    def test_index_page(self):
+        """Test homepage serves the pre-rendered template"""
+        response = self.app.get('/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'text/html')
+        self.assertEqual(response.get_data(as_text=True), self.app_module.INDEX_HTML)
     
     def test_health_endpoint(self):
         """Test health check endpoint"""
         response = self.app.get('/health')
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertEqual(data['status'], 'healthy')
         self.assertIn('redis_connected', data)
         self.assertIn('rate_limiting_enabled', data)
@@ -215,30 +436,54 @@ class TestAPIEndpoints(unittest.TestCase):
         response = self.app.get('/proxy_status')
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('proxy_enabled', data)
         self.assertIn('countries', data)
     
-    @patch.dict(os.environ, {'ADMIN_TOKEN': 'test_token'})
     def test_admin_issue_bypass_unauthorized(self):
         """Test admin bypass endpoint without token"""
         response = self.app.post('/admin/issue_bypass')
         self.assertEqual(response.status_code, 401)
     
-    @patch.dict(os.environ, {'ADMIN_TOKEN': 'test_token'})
     def test_admin_issue_bypass_authorized(self):
         """Test admin bypass endpoint with valid token"""
-        self.app_module.redis_client.setex.return_value = True
+        pipe = self.app_module.redis_client.pipeline.return_value
         
         response = self.app.post('/admin/issue_bypass', 
                                headers={'X-Admin-Token': 'test_token'},
                                json={'ttl_hours': 6})
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertTrue(data['success'])
         self.assertIn('bypass_key', data)
         self.assertIn('expires_at', data)
+        pipe.setex.assert_called_once_with(f"bp:{data['bypass_key']}", 21600, '1')
+    
+    def test_admin_issue_bypass_batch(self):
+        """Test admin bypass endpoint issues several keys in one pipeline"""
+        pipe = self.app_module.redis_client.pipeline.return_value
+        
+        response = self.app.post('/admin/issue_bypass', 
+                               headers={'X-Admin-Token': 'test_token'},
+                               json={'ttl_hours': 1, 'count': 3})
+        self.assertEqual(response.status_code, 200)
+        
+        data = _loads(response.data)
+        self.assertEqual(len(data['bypass_keys']), 3)
+        self.assertEqual(len(set(data['bypass_keys'])), 3)
+        self.assertEqual(data['bypass_key'], data['bypass_keys'][0])
+        for key in data['bypass_keys']:
+            self.assertEqual(len(key), 43)  # Same length as secrets.token_urlsafe(32)
+        self.assertEqual(pipe.setex.call_count, 3)
+        pipe.execute.assert_called_once()
+    
+    def test_admin_issue_bypass_invalid_count(self):
+        """Test admin bypass endpoint rejects an invalid count"""
+        response = self.app.post('/admin/issue_bypass', 
+                               headers={'X-Admin-Token': 'test_token'},
+                               json={'count': 0})
+        self.assertEqual(response.status_code, 400)
     
     def test_get_transcript_invalid_url(self):
         """Test transcript endpoint with invalid URL"""
@@ -246,44 +491,210 @@ class TestAPIEndpoints(unittest.TestCase):
                                json={'url': 'invalid-url'})
         self.assertEqual(response.status_code, 400)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('error', data)
         self.assertIn('Invalid YouTube URL', data['error'])
     
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_success(self, mock_checkout):
+        """Test transcript endpoint formats snippets and full text"""
+        snippets = [
+            NS(start=0.0, duration=1.5, text='Hello'),
+            NS(start=1.5, duration=2.0, text='world')
+        ]
+        _stub_transcript(mock_checkout, snippets)
+        
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/dQw4w9WgXcQ'})
+        self.assertEqual(response.status_code, 200)
+        
+        data = _loads(response.data)
+        self.assertTrue(data['success'])
+        self.assertEqual(data['video_id'], 'dQw4w9WgXcQ')
+        self.assertEqual(data['full_text'], 'Hello world')
+        self.assertEqual(data['transcript'], [
+            {'start': 0.0, 'duration': 1.5, 'text': 'Hello'},
+            {'start': 1.5, 'duration': 2.0, 'text': 'world'}
+        ])
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_falls_back_to_any_language(self, mock_checkout):
+        """Test transcript endpoint uses the first available transcript without re-listing"""
+        from youtube_transcript_api import NoTranscriptFound
+        
+        transcript_list = mock_checkout.return_value.__enter__.return_value.list.return_value
+        transcript_list.find_transcript.side_effect = NoTranscriptFound('dQw4w9WgXcQ', ['en'], [])
+        other_transcript = Mock()
+        other_transcript.fetch.return_value = NS(snippets=[NS(start=0.0, duration=1.0, text='Hola')])
+        transcript_list.__iter__ = Mock(return_value=iter([other_transcript]))
+        
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/dQw4w9WgXcQ'})
+        self.assertEqual(response.status_code, 200)
+        
+        data = _loads(response.data)
+        self.assertEqual(data['full_text'], 'Hola')
+        mock_checkout.return_value.__enter__.return_value.list.assert_called_once_with('dQw4w9WgXcQ')
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_gzip(self, mock_checkout):
+        """Test large transcript responses are gzipped when accepted"""
+        import gzip
+        
+        snippets = [NS(start=float(i), duration=1.0, text='word ' * 10) for i in range(100)]
+        _stub_transcript(mock_checkout, snippets)
+        
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/dQw4w9WgXcQ'},
+                               headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        
+        data = _loads(gzip.decompress(response.data))
+        self.assertEqual(len(data['transcript']), 100)
+        
+        # Clients that don't accept gzip get plain JSON
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/dQw4w9WgXcQ'})
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertEqual(len(_loads(response.data)['transcript']), 100)
+        
+        # Nor do clients that explicitly refuse it (q=0)
+        for accept in ('gzip;q=0', 'identity, *;q=0'):
+            response = self.app.post('/get_transcript',
+                                   json={'url': 'https://youtu.be/dQw4w9WgXcQ'},
+                                   headers={'Accept-Encoding': accept})
+            self.assertNotIn('Content-Encoding', response.headers)
+            self.assertEqual(len(_loads(response.data)['transcript']), 100)
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_cached_in_process(self, mock_checkout):
+        """Test repeat requests for a video are served without refetching"""
+        _stub_transcript(mock_checkout, [NS(start=0.0, duration=1.0, text='Hello')])
+        
+        for _ in range(2):
+            response = self.app.post('/get_transcript',
+                                   json={'url': 'https://youtu.be/aircAruvnKk'})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(_loads(response.data)['full_text'], 'Hello')
+        
+        mock_checkout.return_value.__enter__.return_value.list.assert_called_once_with('aircAruvnKk')
+        self.app_module.redis_client.get.assert_called_once_with('tx:aircAruvnKk')
+        self.app_module.redis_client.setex.assert_called_once()
+        key, ttl, payload = self.app_module.redis_client.setex.call_args[0]
+        self.assertEqual(key, 'tx:aircAruvnKk')
+        self.assertEqual(_loads(payload), [{'start': 0.0, 'duration': 1.0, 'text': 'Hello'}])
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_in_process_cache_expires(self, mock_checkout):
+        """Test in-process cache entries are refetched once their TTL passes"""
+        _stub_transcript(mock_checkout, [NS(start=0.0, duration=1.0, text='Hello')])
+        api = mock_checkout.return_value.__enter__.return_value
+        
+        for now in (1000.0, 1000.0 + self.app_module.TRANSCRIPT_MEMORY_TTL - 1):
+            with patch('app.time.monotonic', return_value=now):
+                response = self.app.post('/get_transcript',
+                                       json={'url': 'https://youtu.be/aircAruvnKk'})
+            self.assertEqual(response.status_code, 200)
+        self.assertEqual(api.list.call_count, 1)
+        
+        with patch('app.time.monotonic', return_value=1000.0 + self.app_module.TRANSCRIPT_MEMORY_TTL):
+            response = self.app.post('/get_transcript',
+                                   json={'url': 'https://youtu.be/aircAruvnKk'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(api.list.call_count, 2)
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_served_from_redis(self, mock_checkout):
+        """Test a transcript cached in Redis skips the YouTube fetch"""
+        self.app_module.redis_client.get.return_value = json.dumps([
+            {'start': 0.0, 'duration': 1.0, 'text': 'Cached'},
+            {'start': 1.0, 'duration': 1.0, 'text': 'text'}
+        ])
+        
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/aircAruvnKk'})
+        self.assertEqual(response.status_code, 200)
+        
+        data = _loads(response.data)
+        self.assertEqual(data['full_text'], 'Cached text')
+        self.assertEqual(data['transcript'][0]['text'], 'Cached')
+        self.app_module.redis_client.get.assert_called_with('tx:aircAruvnKk')
+        mock_checkout.assert_not_called()
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_redis_read_error_fetches(self, mock_checkout):
+        """Test a failing Redis cache read falls through to the YouTube fetch"""
+        self.app_module.redis_client.get.side_effect = Exception('OOM command not allowed')
+        _stub_transcript(mock_checkout, [NS(start=0.0, duration=1.0, text='Fresh')])
+        
+        response = self.app.post('/get_transcript',
+                               json={'url': 'https://youtu.be/aircAruvnKk'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(_loads(response.data)['full_text'], 'Fresh')
+        mock_checkout.return_value.__enter__.return_value.list.assert_called_once_with('aircAruvnKk')
+    
+    @patch('app.checkout_transcript_api')
+    def test_get_transcript_redis_cache_limits(self, mock_checkout):
+        """Test oversized transcripts and TTL 0 skip the Redis cache"""
+        _stub_transcript(mock_checkout, [NS(start=0.0, duration=1.0, text='Hello')])
+        
+        with patch.object(self.app_module, 'TRANSCRIPT_CACHE_MAX_BYTES', 10):
+            response = self.app.post('/get_transcript',
+                                   json={'url': 'https://youtu.be/aircAruvnKk'})
+        self.assertEqual(response.status_code, 200)
+        self.app_module.redis_client.get.assert_called_once_with('tx:aircAruvnKk')
+        self.app_module.redis_client.setex.assert_not_called()
+        
+        self.app_module.fetch_transcript.cache_clear()
+        self.app_module.redis_client.reset_mock()
+        with patch.object(self.app_module, 'TRANSCRIPT_CACHE_TTL', 0):
+            response = self.app.post('/get_transcript',
+                                   json={'url': 'https://youtu.be/aircAruvnKk'})
+        self.assertEqual(response.status_code, 200)
+        self.app_module.redis_client.get.assert_not_called()
+        self.app_module.redis_client.setex.assert_not_called()
+    
+    def test_get_transcript_overlong_url(self):
+        """Test overlong URLs are rejected before they reach the memoized parser"""
+        self.app_module.extract_video_id.cache_clear()
+        url = 'https://www.youtube.com/watch?v=dQw4w9WgXcQ&x=' + 'a' * 4096
+        response = self.app.post('/get_transcript', json={'url': url})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.app_module.extract_video_id.cache_info().currsize, 0)
+    
     def test_get_transcript_missing_url(self):
         """Test transcript endpoint with missing URL"""
         response = self.app.post('/get_transcript', json={})
         self.assertEqual(response.status_code, 400)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('error', data)
 
 class TestSummarizationEndpoint(unittest.TestCase):
     """Test summarization functionality"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for the whole class"""
+        cls.app = app.app.test_client()
+    
     def setUp(self):
         """Set up test environment"""
-        with patch.dict(os.environ, {
-            'REDIS_URL': 'redis://localhost:6379',
-            'DAILY_LIMIT': '5',
-            'ADMIN_TOKEN': 'test_token',
-            'OPENAI_API_KEY': 'test_openai_key'
-        }):
-            import app
-            self.app_module = app
-            self.app = app.app.test_client()
-            self.app_module.redis_client = Mock()
-            
-            # Mock OpenAI client
-            self.mock_openai = Mock()
-            self.app_module.openai_client = self.mock_openai
+        self.app_module = app
+        self.app_module.redis_client = Mock()
+        
+        # Mock OpenAI client
+        self.mock_openai = Mock()
+        self.app_module.openai_client = self.mock_openai
     
     def test_summarize_missing_text(self):
         """Test summarization endpoint with missing text"""
         response = self.app.post('/summarize_transcript', json={})
         self.assertEqual(response.status_code, 400)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('error', data)
         self.assertIn('Please provide transcript text', data['error'])
     
@@ -292,7 +703,7 @@ class TestSummarizationEndpoint(unittest.TestCase):
         response = self.app.post('/summarize_transcript', json={'text': ''})
         self.assertEqual(response.status_code, 400)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('error', data)
     
     def test_summarize_no_openai_client(self):
@@ -302,42 +713,38 @@ class TestSummarizationEndpoint(unittest.TestCase):
         response = self.app.post('/summarize_transcript', json={'text': 'Test transcript'})
         self.assertEqual(response.status_code, 503)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('OpenAI summarization not available', data['error'])
     
-    @patch('app.openai_client')
-    def test_summarize_success(self, mock_openai_instance):
+    def test_summarize_success(self):
         """Test successful summarization"""
         # Mock OpenAI response
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = "This is a test summary"
-        mock_response.usage.total_tokens = 150
+        mock_response = NS(
+            choices=[NS(message=NS(content="This is a test summary"))],
+            usage=NS(total_tokens=150)
+        )
         
-        mock_openai_instance.chat.completions.create.return_value = mock_response
-        self.app_module.openai_client = mock_openai_instance
+        self.mock_openai.chat.completions.create.return_value = mock_response
         
         response = self.app.post('/summarize_transcript', 
                                json={'text': 'This is a test transcript about testing.'})
         self.assertEqual(response.status_code, 200)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertTrue(data['success'])
         self.assertEqual(data['summary'], "This is a test summary")
         self.assertEqual(data['model_used'], 'gpt-4o-mini')
         self.assertEqual(data['tokens_used'], 150)
     
-    @patch('app.openai_client')
-    def test_summarize_openai_error(self, mock_openai_instance):
+    def test_summarize_openai_error(self):
         """Test OpenAI API error handling"""
-        mock_openai_instance.chat.completions.create.side_effect = Exception("API Error")
-        self.app_module.openai_client = mock_openai_instance
+        self.mock_openai.chat.completions.create.side_effect = Exception("API Error")
         
         response = self.app.post('/summarize_transcript', 
                                json={'text': 'Test transcript'})
         self.assertEqual(response.status_code, 500)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('OpenAI API error', data['error'])
     
     def test_summarize_text_truncation(self):
@@ -345,10 +752,10 @@ class TestSummarizationEndpoint(unittest.TestCase):
         # Create text longer than max_chars (30000)
         long_text = "A" * 35000
         
-        mock_response = Mock()
-        mock_response.choices = [Mock()]
-        mock_response.choices[0].message.content = "Summary of truncated text"
-        mock_response.usage.total_tokens = 100
+        mock_response = NS(
+            choices=[NS(message=NS(content="Summary of truncated text"))],
+            usage=NS(total_tokens=100)
+        )
         
         self.mock_openai.chat.completions.create.return_value = mock_response
         
@@ -362,23 +769,29 @@ class TestSummarizationEndpoint(unittest.TestCase):
         
         # Should include truncation indicator
         self.assertIn('...', user_message)
+        self.assertTrue(user_message.endswith('A' * 30000 + '...'))
         # Should be shorter than original
         self.assertLess(len(user_message), len(long_text))
 
 class TestRateLimitMiddleware(unittest.TestCase):
     """Test rate limiting middleware"""
     
+    @classmethod
+    def setUpClass(cls):
+        """Create one test client for the whole class"""
+        cls.app = app.app.test_client()
+    
     def setUp(self):
         """Set up test environment"""
-        with patch.dict(os.environ, {
-            'REDIS_URL': 'redis://localhost:6379',
-            'DAILY_LIMIT': '2',  # Low limit for testing
-            'ADMIN_TOKEN': 'test_token'
-        }):
-            import app
-            self.app_module = app
-            self.app = app.app.test_client()
-            self.app_module.redis_client = Mock()
+        self.app_module = app
+        self.app_module.redis_client = Mock()
+        self.app_module.redis_client.get.return_value = None  # Transcript cache miss
+        self.app_module.fetch_transcript.cache_clear()
+    
+    def rate_limit_redis_calls(self):
+        """Names of Redis calls made, excluding transcript cache (tx:*) reads/writes"""
+        return [name for name, args, _ in self.app_module.redis_client.method_calls
+                if not (args and str(args[0]).startswith('tx:'))]
     
     def test_rate_limit_middleware_skips_non_transcript_endpoints(self):
         """Test middleware skips non-transcript endpoints"""
@@ -390,6 +803,15 @@ class TestRateLimitMiddleware(unittest.TestCase):
         response = self.app.get('/proxy_status')
         self.assertEqual(response.status_code, 200)
     
+    def test_probe_endpoints_do_not_touch_redis(self):
+        """Test health and proxy status make no Redis calls, even with a bypass key"""
+        for path in ['/health', '/proxy_status']:
+            response = self.app.get(path, headers={'X-Bypass-Key': 'some_key'})
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('X-RateLimit-Limit', response.headers)
+        
+        self.assertEqual(self.app_module.redis_client.method_calls, [])
+    
     @patch('app.check_rate_limit')
     def test_rate_limit_middleware_applies_to_transcript(self, mock_check):
         """Test middleware applies to transcript endpoint"""
@@ -414,6 +836,38 @@ class TestRateLimitMiddleware(unittest.TestCase):
         # Should have called rate limit check
         mock_check.assert_called_once()
     
+    @patch('app.checkout_transcript_api')
+    def test_rate_limit_headers_reuse_check_result(self, mock_checkout):
+        """Test rate limit headers come from the check, without extra Redis calls"""
+        _stub_transcript(mock_checkout, [])
+        self.app_module.redis_client.evalsha.return_value = 1
+        
+        response = self.app.post('/get_transcript', json={'url': 'https://youtu.be/dQw4w9WgXcQ'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['X-RateLimit-Limit'], str(self.app_module.DAILY_LIMIT))
+        self.assertEqual(response.headers['X-RateLimit-Remaining'], str(self.app_module.DAILY_LIMIT - 1))
+        self.assertIn('X-RateLimit-Reset', response.headers)
+        
+        # Only the single rate limit script call hit Redis (besides the transcript cache)
+        self.assertEqual(self.rate_limit_redis_calls(), ['evalsha'])
+    
+    @patch('app.checkout_transcript_api')
+    def test_bypassed_request_single_redis_call(self, mock_checkout):
+        """Test a bypassed request costs one script call and gets no rate limit headers"""
+        _stub_transcript(mock_checkout, [])
+        self.app_module.redis_client.evalsha.return_value = -1  # Bypass key exists
+        
+        response = self.app.post('/get_transcript', json={'url': 'https://youtu.be/dQw4w9WgXcQ'},
+                                 headers={'X-Bypass-Key': 'test_bypass_key'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('X-RateLimit-Limit', response.headers)
+        
+        self.app_module.redis_client.evalsha.assert_called_once()
+        _, numkeys, key, bypass_key, ttl = self.app_module.redis_client.evalsha.call_args[0]
+        self.assertEqual(numkeys, 2)
+        self.assertEqual(bypass_key, 'bp:test_bypass_key')
+        self.assertEqual(self.rate_limit_redis_calls(), ['evalsha'])
+    
     @patch('app.check_rate_limit')
     def test_rate_limit_middleware_blocks_exceeded(self, mock_check):
         """Test middleware blocks when rate limit exceeded"""
@@ -423,12 +877,19 @@ class TestRateLimitMiddleware(unittest.TestCase):
         response = self.app.post('/get_transcript', json={'url': 'https://youtube.com/watch?v=test123'})
         self.assertEqual(response.status_code, 429)
         
-        data = json.loads(response.data)
+        data = _loads(response.data)
         self.assertIn('Rate limit exceeded', data['error'])
 
 if __name__ == '__main__':
-    # Run all tests with detailed output
-    unittest.main(verbosity=2, exit=False)
+    # Run the test classes in parallel when pytest-xdist is installed,
+    # otherwise fall back to unittest with detailed output
+    try:
+        import pytest
+        import xdist  # noqa: F401
+    except ImportError:
+        unittest.main(verbosity=2, exit=False)
+    else:
+        sys.exit(pytest.main([__file__, "-n", "auto", "--dist=loadscope"]))
     
     # Alternative: Run specific test suites
     # python -m unittest test_unit.TestRateLimiting -v
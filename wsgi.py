@@ -0,0 +1,14 @@
+"""
+WSGI entry point for production (gunicorn with gevent workers)
+"""
+
+# Patch the standard library before anything else imports sockets, so blocking
+# calls to YouTube, Redis and OpenAI yield to other greenlets instead of
+# tying up the worker
+from gevent import monkey
+monkey.patch_all()
+
+from app import app  # noqa: E402
+
+if __name__ == '__main__':
+    app.run()